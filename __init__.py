@@ -1,66 +1,352 @@
 import csv
-import json
 import logging
+import orjson
+import os
+import queue
 import re
+import threading
 import time
-import traceback
-from bs4 import BeautifulSoup
+import urllib3
 from datetime import datetime
-from seleniumwire import webdriver
-from selenium.common.exceptions import NoSuchElementException
+from functools import lru_cache
+from selenium import webdriver
 from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selectolax.lexbor import LexborHTMLParser
 from concurrent.futures import ThreadPoolExecutor
-from urllib.parse import urlparse, urlunparse
+
+
+# Hides login wall dialogs with CSS and clicks popup dismissal buttons whenever they are added to the page
+# Formatted with a JSON list of button selectors and a JSON string with the selector of dialogs to hide
+DISMISS_POPUPS_SCRIPT = """
+(() => {
+    const selectors = %(buttons)s;
+    const hiddenSelector = %(hidden)s;
+    let styleAdded = false;
+    new MutationObserver(() => {
+        if (!styleAdded && document.head) {
+            const style = document.createElement("style");
+            style.textContent = hiddenSelector + " { display: none !important; }";
+            document.head.appendChild(style);
+            styleAdded = true;
+        }
+        for (const selector of selectors) {
+            const button = document.querySelector(selector);
+            if (button) {
+                button.click();
+            }
+        }
+    }).observe(document, {childList: true, subtree: true});
+})();
+"""
+
+# Collects raw details of every event card, mirrors the selectolax extraction in create_soup
+# Arguments: dict of CSS selectors (EventScraper.EVENT_SELECTORS)
+EXTRACT_EVENTS_SCRIPT = """
+const sel = arguments[0];
+// Text nodes joined by a space with whitespace collapsed, same as the place fallback in create_soup
+const joinedText = node => {
+    const parts = [];
+    const walker = document.createTreeWalker(node, NodeFilter.SHOW_TEXT);
+    while (walker.nextNode()) {
+        parts.push(walker.currentNode.nodeValue);
+    }
+    return parts.join(" ").split(/\s+/).filter(Boolean).join(" ");
+};
+return Array.from(document.querySelectorAll(sel.card)).flatMap(card => {
+    const link = card.querySelector(sel.link);
+    const title = link && link.querySelector(sel.title);
+    // Skip cards without a link or title instead of failing the whole page
+    if (!title) {
+        return [];
+    }
+    const dateElement = card.querySelector(sel.dateElement);
+    const date = dateElement && dateElement.querySelector(sel.date);
+    const placeParent = card.querySelector(sel.placeParent);
+    const placeLink = placeParent && placeParent.querySelector(sel.placeLink);
+    const placeDiv = placeParent && placeParent.querySelector("div");
+    return [{
+        date: date ? date.textContent : "No Date Available",
+        link: link.getAttribute("href") || "",
+        title: title.textContent,
+        place: placeLink ? placeLink.textContent : placeDiv ? joinedText(placeDiv) : ""
+    }];
+});
+"""
+
+# Matches cells of the CSV file which contain a Facebook URL
+URL_PATTERN = re.compile(r"^https?://(?:[\w-]+\.)*facebook\.com/")
+
+# Scrolls to the bottom until the page height is unchanged for two checks in a row or max steps are reached
+# Arguments: interval between scrolls in ms, max number of scrolls, Selenium async callback
+SCROLL_PAGE_SCRIPT = """
+const [interval, maxSteps, done] = arguments;
+let lastHeight = 0, stableSteps = 0, steps = 0;
+(function scroll() {
+    window.scrollTo(0, document.body.scrollHeight);
+    setTimeout(() => {
+        const height = document.body.scrollHeight;
+        stableSteps = height === lastHeight ? stableSteps + 1 : 0;
+        lastHeight = height;
+        if (stableSteps >= 2 || ++steps >= maxSteps) {
+            done(height);
+        } else {
+            scroll();
+        }
+    }, interval);
+})();
+"""
+
+# Day, month abbreviation and optional year following the weekday,
+# e.g. "pt., 15 mar" -> ("15", "mar", None), "wt., 3 sty 2025" -> ("3", "sty", "2025")
+POLISH_DATE_PATTERN = re.compile(r",\s*(\d{1,2})\s+(\w{3})\w*(?:\s+(\d{4}))?")
+
+# Separator of a date range, en dash or hyphen with optional surrounding whitespace
+DATE_RANGE_PATTERN = re.compile(r"\s*[–-]\s*")
+
+# Dictionary mapping Polish month abbreviations to their numeric equivalents
+MONTHS_POLISH = {
+    "sty": 1,
+    "lut": 2,
+    "mar": 3,
+    "kwi": 4,
+    "maj": 5,
+    "cze": 6,
+    "lip": 7,
+    "sie": 8,
+    "wrz": 9,
+    "paź": 10,
+    "lis": 11,
+    "gru": 12
+}
+
+
+@lru_cache(maxsize=2048)
+def parse_polish_date(date_string, current_year):
+    """
+    Converts Polish date strings into a standardized date format.
+    Results are cached because many events on a page share the same date string.
+    :param date_string: The original date string in Polish format.
+    :param current_year: The year used for converted dates that do not state their own year.
+    :return: The date in 'DD/MM/YY' format.
+    """
+    # empty formatted date
+    formatted_date = ""
+    # Remove everything after "o" letter if it exists
+    date_string = date_string.split(" o ")[0]
+    # Remove leading and trailing whitespaces
+    date_string = date_string.strip()
+    
+    # Check if there's a range of dates (indicated by "-") and trasform to format: dd month – dd month
+    date_array = DATE_RANGE_PATTERN.split(date_string)
+    if len(date_array) > 1:
+        # Drop the weekday before the first date, e.g. "pt., 15 mar" -> "15 mar"
+        date_array[0] = date_array[0].split(",", 1)[-1].strip()
+        formatted_date = " – ".join(date_array)
+    else:
+        # Extract day, month abbreviation and optional year after the weekday in a single regex scan
+        match = POLISH_DATE_PATTERN.search(date_string)
+        if not match:
+            return "Brak daty"
+        day_num = int(match.group(1))
+
+        # Convert month abbreviation to its numeric equivalent
+        month = MONTHS_POLISH.get(match.group(2).lower())
+        if month is None:
+            return "Brak daty"
+
+        # Facebook prints the year only for dates outside the current one, otherwise use the year snapshot taken for this run
+        year = int(match.group(3)) if match.group(3) else current_year
+
+        # Convert the date string to a formatted date
+        formatted_date = f"{day_num:02d}/{month:02d}/{year % 100:02d}"
+
+    return formatted_date
+
+
+@lru_cache(maxsize=4096)
+def strip_query_string(url):
+    """
+    Removes the query string and fragment from a URL.
+    Results are cached because the same event link is often found on several pages.
+    :param url: The original URL with a possible query string.
+    :return: The URL without the query string.
+    """
+    return url.partition("?")[0].partition("#")[0]
+
+
+@lru_cache(maxsize=512)
+def parse_event_date(date_str):
+    """
+    Converts a 'DD/MM/YY' date string to a datetime object.
+    Results are cached because the same date keys are parsed on every sort.
+    :param date_str: The date string to convert.
+    :return: The datetime object representing the date, or None if the string is not a single date.
+    """
+    try:
+        return datetime.strptime(date_str, '%d/%m/%y')
+    except ValueError:
+        return None
+
+
+def is_facebook_cookie(cookie):
+    """
+    Checks whether a browser cookie belongs to Facebook or one of its subdomains.
+    :param cookie: Cookie object as returned by Chrome DevTools Protocol.
+    :return: True if the cookie domain is facebook.com or its subdomain.
+    """
+    domain = cookie.get("domain", "").lstrip(".")
+    return domain == "facebook.com" or domain.endswith(".facebook.com")
 
 
 class EventScraper:
-    def __init__(self, csv_file):
+    def __init__(self, csv_file, max_workers=None, debugger_address=None, resume=False):
         """
         Initializes the scraper with necessary variables and configurations.
         :param csv_file: Path to the CSV file for storing scraped data.
+        :param max_workers: Number of pages scraped concurrently, each worker uses a browser from the pool.
+            Defaults to the FB_CONCURRENCY environment variable or 3.
+        :param debugger_address: Optional "host:port" of an already running Chrome started with
+            --remote-debugging-port. Workers then open tabs in it instead of launching their own browsers.
+        :param resume: Continue an interrupted crawl, pages already saved in the JSONL file are not scraped again.
         """
         # CSV file with URLs
         self.CSV_FILE = csv_file
+        # Final sorted events file and JSONL file with results appended page by page during the crawl
+        self.EVENTS_DATA_FILE = "events_data.json"
+        self.PAGES_DATA_FILE = "events_data.jsonl"
+        # Browser cookies kept between runs, so consent and login popups do not come back
+        self.COOKIES_FILE = "cookies.json"
 
-        # Define CSS class selectors for scraping content using both Selenium and BeautifulSoup
+        # Define CSS class selectors for scraping content using both Selenium and selectolax
         self.CLASS_TO_SCRAPE_SELENIUM = "div.x6s0dn4.x1lq5wgf.xgqcy7u.x30kzoy.x9jhf4c.x1olyfxc.x9f619.x78zum5.x1e56ztr.xyamay9.x1pi30zi.x1l90r2v.x1swvt13.x1gefphp"
-        self.CLASS_TO_SCRAPE_BS4 = "x6s0dn4 x1lq5wgf xgqcy7u x30kzoy x9jhf4c x1olyfxc x9f619 x78zum5 x1e56ztr xyamay9 x1pi30zi x1l90r2v x1swvt13 x1gefphp"
-        self.COOKIE_CONSENT_CSS_CLASS = ".x9f619.x1n2onr6.x1ja2u2z.x78zum5.xdt5ytf.x193iq5w.xeuugli.x1iyjqo2.xs83m0k.x150jy0e.x1e558r4.xjkvuk6.x1iorvi4.xdl72j9"
-        self.LOGIN_PROMPT_CSS_CLASS = ".x1i10hfl.x1ejq31n.xd10rxx.x1sy0etr.x17r0tee.x1ypdohk.xe8uvvx.xdj266r.x11i5rnm.xat24cr.x1mh8g0r.x16tdsg8.x1hl2dhg.xggy1nq.x87ps6o.x1lku1pv.x1a2a7pz.x6s0dn4.x14yjl9h.xudhj91.x18nykt9.xww2gxu.x972fbf.xcfux6l.x1qhh985.xm0m39n.x9f619.x78zum5.xl56j7k.xexx8yu.x4uap5.x18d9i69.xkhd6sd.x1n2onr6.xc9qbxq.x14qfxbe.x1qhmfi1"
-        # Event parts elements to scrap by BS4
+        # Locator and wait condition for the event cards, built once and reused for every page
+        self.EVENT_CARD_LOCATOR = (By.CSS_SELECTOR, self.CLASS_TO_SCRAPE_SELENIUM)
+        self.EVENT_CARD_PRESENT = EC.presence_of_element_located(self.EVENT_CARD_LOCATOR)
+        # Popup buttons are matched by role and label (English and Polish), Facebook rotates their classes
+        self.COOKIE_CONSENT_SELECTOR = '[role="dialog"] [role="button"][aria-label="Allow all cookies"], [role="dialog"] [role="button"][aria-label="Zezwól na wszystkie pliki cookie"]'
+        self.LOGIN_PROMPT_SELECTOR = '[role="dialog"] [role="button"][aria-label="Close"], [role="dialog"] [role="button"][aria-label="Zamknij"]'
+        # Dialogs with a login form are hidden with CSS even before their close button is rendered
+        self.LOGIN_WALL_SELECTOR = 'div[role="dialog"]:has(input[name="email"])'
+        # Event parts elements to scrap by selectolax
         self.EVENT_DATE_ELEMENT_CSS_CLASS = "x193iq5w xeuugli x13faqbe x1vvkbs x10flsy6 x1lliihq x1s928wv xhkezso x1gmr53x x1cpjm7i x1fgarty x1943h6x x1tu3fi x3x7a5m x1nxh6w3 x1sibtaa xo1l8bm xzsf02u x1yc453h"
         self.EVENT_DATE_CSS_CLASS = "x1lliihq x6ikm8r x10wlt62 x1n2onr6 xlyipyv xuxw1ft"
         self.EVENT_LINK = "x1i10hfl xjbqb8w x1ejq31n xd10rxx x1sy0etr x17r0tee x972fbf xcfux6l x1qhh985 xm0m39n x9f619 x1ypdohk xt0psk2 xe8uvvx xdj266r x11i5rnm xat24cr x1mh8g0r xexx8yu x4uap5 x18d9i69 xkhd6sd x16tdsg8 x1hl2dhg xggy1nq x1a2a7pz x1heor9g xt0b8zv x1s688f"
         self.EVENT_PLACE_PARENT = "x1gslohp"
         self.EVENT_BY_PLACE = "x1i10hfl xjbqb8w x1ejq31n xd10rxx x1sy0etr x17r0tee x972fbf xcfux6l x1qhh985 xm0m39n x9f619 x1ypdohk xt0psk2 xe8uvvx xdj266r x11i5rnm xat24cr x1mh8g0r xexx8yu x4uap5 x18d9i69 xkhd6sd x16tdsg8 x1hl2dhg xggy1nq x1a2a7pz xt0b8zv xi81zsa x1s688f"
+        # CSS selectors built from the class names above
+        self.EVENT_DATE_ELEMENT_SELECTOR = self.css_selector("span", self.EVENT_DATE_ELEMENT_CSS_CLASS)
+        self.EVENT_DATE_SELECTOR = self.css_selector("span", self.EVENT_DATE_CSS_CLASS)
+        self.EVENT_LINK_SELECTOR = self.css_selector("a", self.EVENT_LINK)
+        self.EVENT_PLACE_PARENT_SELECTOR = self.css_selector("div", self.EVENT_PLACE_PARENT)
+        self.EVENT_BY_PLACE_SELECTOR = self.css_selector("a", self.EVENT_BY_PLACE)
+        # Event title is the first span with an empty class attribute inside the event link, a span without one is accepted too
+        self.EVENT_TITLE_SELECTOR = 'span[class=""], span:not([class])'
+        # Selectors passed to the in-browser extraction script
+        self.EVENT_SELECTORS = {
+            "card": self.CLASS_TO_SCRAPE_SELENIUM,
+            "dateElement": self.EVENT_DATE_ELEMENT_SELECTOR,
+            "date": self.EVENT_DATE_SELECTOR,
+            "link": self.EVENT_LINK_SELECTOR,
+            "title": self.EVENT_TITLE_SELECTOR,
+            "placeParent": self.EVENT_PLACE_PARENT_SELECTOR,
+            "placeLink": self.EVENT_BY_PLACE_SELECTOR,
+        }
 
-        # Setup logging to file for error tracking and debugging
-        self.logger = logging.getLogger(__name__)
-        logging.basicConfig(filename="scraping.log", level=logging.WARNING)
+        # Headers for plain HTTP requests, mimic a regular Polish browser session
+        self.HTTP_HEADERS = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+            "Accept-Language": "pl-PL,pl;q=0.9",
+            "Cookie": "locale=pl_PL",
+        }
 
-        # Flag to track whether popups have been dismissed
-        self.popups_dismissed = False
+        # Images, media, fonts, stylesheets and trackers are never parsed, so the browser does not download them
+        self.BLOCKED_URL_PATTERNS = [
+            "*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.svg*", "*.ico*",
+            "*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*",
+            "*.woff*", "*.ttf*", "*.otf*",
+            "*.css*",
+            # Third-party analytics and ad trackers
+            "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*/ads/*",
+            # Facebook's own pixel and logging beacons, the pixel path is matched exactly so pages with a "tr..." slug still load
+            "*facebook.com/tr/*", "*facebook.com/tr?*", "*/ajax/bz*",
+        ]
+
+        # Module logger, handlers are configured once by the entry point
+        self.logger = logging.getLogger(__name__)
 
-        # start driver only one time during instance
-        self.start_driver()
+        # Address of a shared running Chrome, None launches a new browser per driver
+        self.debugger_address = debugger_address
+
+        # Number of worker threads scraping pages concurrently
+        self.max_workers = max_workers or int(os.getenv("FB_CONCURRENCY", "3"))
+
+        # Shared HTTP connection pool for plain page fetches, keeps TCP and TLS connections alive between URLs
+        self.http = urllib3.PoolManager(
+            maxsize=self.max_workers,
+            headers=self.HTTP_HEADERS,
+            timeout=10,
+            retries=urllib3.Retry(total=3, connect=0, read=0)
+        )
+
+        # Pool of warm drivers reused across URLs, a driver is used by one worker at a time
+        self.driver_pool = queue.Queue()
+        self.drivers = []
+        self.drivers_lock = threading.Lock()
+        # Number of pages loaded by each driver, a driver is restarted after MAX_DRIVER_USES pages to free browser memory
+        self.MAX_DRIVER_USES = 50
+        # Seconds a worker waits for a free driver before giving up on a page, so lost drivers cannot hang the run
+        self.DRIVER_POOL_TIMEOUT = 300
+        self.driver_uses = {}
+
+        # URLs scraped without errors, skipped when scrape_subpages is called again
+        self.processed_urls = set()
+
+        if resume:
+            # Pages saved by the interrupted crawl count as processed
+            self.processed_urls.update(page["url"] for page in self.read_pages_data(self.PAGES_DATA_FILE))
+        # A new crawl empties the page results file once, when scraping actually starts, not on construction
+        self.clear_pages_data = not resume
+
+        # Year used for converted dates, snapshotted once per run instead of per event
+        self.current_year = datetime.now().year
 
         # calculate time
         self.start_time = None
         self.end_time = None
 
 
+    def read_urls(self):
+        """
+        Reads page URLs from the CSV file.
+        The header row, empty cells, non-Facebook URLs and duplicates are skipped.
+        :return: List of unique URLs to scrape in file order.
+        """
+        with open(self.CSV_FILE, "r", newline="") as csvfile:
+            urls = (cell.strip() for row in csv.reader(csvfile) for cell in row)
+            return list(dict.fromkeys(url for url in urls if URL_PATTERN.match(url)))
+
+
+    def css_selector(self, tag, css_class):
+        """
+        Builds a CSS selector matching a tag which has all of the given classes.
+        :param tag: The tag name, e.g. "div".
+        :param css_class: Space separated class names.
+        :return: The CSS selector string.
+        """
+        return tag + "".join(f".{class_name}" for class_name in css_class.split())
+
+
     def remove_query_string(self, url):
         """
         Cleans URLs by removing the query string.
         :param url: The original URL with a possible query string.
         :return: The URL without the query string.
         """
-        parsed_url = urlparse(url)
-        cleaned_url = urlunparse((parsed_url.scheme, parsed_url.netloc, parsed_url.path, '', '', ''))
-        return cleaned_url
+        return strip_query_string(url)
 
 
     def convert_dates(self, date_string):
@@ -69,113 +355,50 @@ class EventScraper:
         :param date_string: The original date string in Polish format.
         :return: The date in 'DD/MM/YY' format.
         """
-        # empty formatted date
-        formatted_date = ""
-        # Remove everything after "o" letter if it exists
-        date_string = date_string.split(" o ")[0]
-        # Remove leading and trailing whitespaces
-        date_string = date_string.strip()
-        
-        # Dictionary mapping Polish month abbreviations to their numeric equivalents
-        months_polish = {
-            "sty": 1,
-            "lut": 2,
-            "mar": 3,
-            "kwi": 4,
-            "maj": 5,
-            "cze": 6,
-            "lip": 7,
-            "sie": 8,
-            "wrz": 9,
-            "paź": 10,
-            "lis": 11,
-            "gru": 12
-        }
-        
-        # Check if there's a range of dates (indicated by "-") and trasform to format: dd month - dd month
-        if "–" in date_string:
-            date_array = date_string.split("–")
-            if len(date_array) > 0:
-                date_array[0] = date_array[0].split(' ', 1)[1].strip()
-                formatted_date = (" –").join(date_array)
-        else:
-            try:
-                # Extract day, month abbreviation, and year from the date string parts
-                # Split the date string by comma
-                parts = date_string.split(",")
-                if len(parts) >= 2:
-                    day_str, rest = parts[1].strip().split()
-                    day_num = int(day_str)
-                    month_str = rest.split()[0].lower()[:3]  # Convert month abbreviation to lowercase
-                else:
-                    formatted_date = date_string
-                    raise ValueError("Date string does not contain expected parts")
-            except ValueError:
-                return "Brak daty" # formatted_date = "Brak Daty"
-
-            # Convert month abbreviation to its numeric equivalent
-            month = months_polish.get(month_str)
-
-            # Convert the date string to a formatted date
-            formatted_date = f"{day_num:02d}/{month:02d}/24"
-
-        return formatted_date
+        return parse_polish_date(date_string, self.current_year)
 
 
     def scroll_down_page(self, driver):
         """
         Scrolls to the bottom of a dynamically loading webpage to ensure all content is loaded.
+        The scroll loop runs inside the browser in a single call and finishes once the page height stops growing.
         :param driver: The Selenium WebDriver instance.
+        :return: The final scroll height of the page.
         """
-        last_height = 0
-
-        while True:
-            # Scroll down to the bottom of the page
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)  # Wait for new content to load
-
-            # Calculate new scroll height and compare with last scroll height
-            new_height = driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                break  # Break the loop when the bottom of the page is reached
-            last_height = new_height
+        return driver.execute_async_script(SCROLL_PAGE_SCRIPT, 1000, 30)
 
 
     def dismiss_popups(self, driver):
         """
-        Dismisses cookie consent popup and login prompt that may appear on the webpage.
-        This function aims to ensure that these popups do not interfere with the scraping process
-        by explicitly looking for and clicking the dismissal buttons.
+        Installs a script which dismisses the cookie consent popup and the login prompt
+        and hides login wall dialogs.
+        The script runs in every document the driver loads and clicks the dismissal buttons
+        as soon as they appear, so no extra WebDriver calls are needed per page.
 
         :param driver: The Selenium WebDriver instance used for navigating and interacting with web pages.
         """
+        script = DISMISS_POPUPS_SCRIPT % {
+            "buttons": orjson.dumps([self.COOKIE_CONSENT_SELECTOR, self.LOGIN_PROMPT_SELECTOR]).decode(),
+            "hidden": orjson.dumps(self.LOGIN_WALL_SELECTOR).decode(),
+        }
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": script})
 
-        # Attempt to dismiss the cookie consent popup if it appears
-        if not self.popups_dismissed:
-            # Attempt to dismiss the cookie consent popup if it appears
-            try:
-                # Locate the accept button for cookie consent using its CSS selector
-                accept_cookie_button = driver.find_element(By.CSS_SELECTOR, self.COOKIE_CONSENT_CSS_CLASS)
-                # Click the accept button to dismiss the cookie consent popup
-                accept_cookie_button.click()
-            except NoSuchElementException:
-                self.logger.warning("Cookie consent popup not found")
-                # Print the full traceback to help diagnose the issue
-                traceback.print_exc()
-
-            # Update the flag to indicate that popups have been dismissed
-            self.popups_dismissed = True
-
-        # Attempt to dismiss the login prompt if it appears
+
+    def fetch_static_page(self, url):
+        """
+        Fetches the page over plain HTTP without using a browser.
+        :param url: The URL to fetch.
+        :return: The HTML content of the page or None if the request failed.
+        """
         try:
-            # Locate the close button for the login prompt using its CSS selector
-            close_login_prompt = driver.find_element(By.CSS_SELECTOR, self.LOGIN_PROMPT_CSS_CLASS)
-            # Click the close button to dismiss the login prompt
-            close_login_prompt.click()
-        except NoSuchElementException:
-            self.logger.warning("Login prompt popup not found")
-            # Print the full traceback to help diagnose the issue
-            traceback.print_exc()
+            response = self.http.request("GET", url)
+            if response.status != 200:
+                self.logger.info("Static fetch of %s returned HTTP %s", url, response.status)
+                return None
+            return response.data.decode("utf-8", errors="replace")
+        except Exception as e:
+            self.logger.info("Static fetch failed for %s: %s", url, e)
+            return None
 
 
     def scrape_page(self, url):
@@ -185,36 +408,48 @@ class EventScraper:
         :param url: The URL to process and scrape data from.
         :return: A dictionary of extracted data keyed by date.
         """
-        driver = self.driver # Initialize the driver variable
+        # Try plain HTTP first, the browser is only needed when events are rendered by JavaScript
+        page_source = self.fetch_static_page(url)
+        if page_source:
+            extracted_contents = self.create_soup(page_source)
+            if extracted_contents:
+                print(f"url (static): {url}")
+                self.processed_urls.add(url)
+                return extracted_contents
+
+        try:
+            driver = self.driver_pool.get(timeout=self.DRIVER_POOL_TIMEOUT) # Take a warm driver from the pool
+        except queue.Empty:
+            # Page is not marked as processed, so it is scraped again on the next call
+            self.logger.error("No driver available for %s within %s seconds", url, self.DRIVER_POOL_TIMEOUT)
+            return {}
 
         try:
             # Configure and initialize the Selenium WebDriver
             driver.get(url)
-            time.sleep(2)
             print(f"url: {url}")
 
-            # Dismiss any pop-ups or consent modals that may interfere with page content access
-            self.dismiss_popups(driver)
+            # Wait for the first event card instead of sleeping for a fixed time
+            try:
+                WebDriverWait(driver, 10).until(self.EVENT_CARD_PRESENT)
+            except TimeoutException:
+                self.logger.info("No events found on the Facebook page: %s", url)
+                self.processed_urls.add(url)
+                return {}  # Return an empty dictionary to indicate no events
 
             # Scroll down the page to trigger loading of all dynamic content
             self.scroll_down_page(driver)
 
-            # Step 1: Check if elements are present immediately after page load
-            if not driver.find_elements(By.CSS_SELECTOR, self.CLASS_TO_SCRAPE_SELENIUM):
-                # Step 2: Wait for the page to fully load and then recheck
-                try:
-                    WebDriverWait(driver, 5).until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, self.CLASS_TO_SCRAPE_SELENIUM)))
-                except TimeoutException:
-                    self.logger.info(f"No events found on the Facebook page: {url}")
-                    extracted_contents = {}  # Return an empty dictionary to indicate no events
-            page_source = driver.page_source
-            extracted_contents = self.create_soup(page_source)
+            # Extract events inside the browser instead of transferring and parsing the whole page source
+            extracted_contents = self.extract_events_in_browser(driver)
             if not extracted_contents:
-                self.logger.warning(f"No content extracted from {url}")
+                self.logger.warning("No content extracted from %s", url)
+            self.processed_urls.add(url)
         except Exception as e:
-            self.logger.error(f"Error processing URL {url}: {e}")
-            traceback.print_exc()
+            self.logger.error("Error processing URL %s: %s", url, e, exc_info=True)
             extracted_contents = {}
+        finally:
+            self.release_driver(driver)
         return extracted_contents
 
 
@@ -226,92 +461,186 @@ class EventScraper:
         Parameters:
             urls (list): List of URLs to scrape data from.
         """
-        # Initialize a dictionary to store all scraped events
-        all_events_obj = {}
-        
+        # Snapshot the current year once for all dates converted during this run
+        self.current_year = datetime.now().year
+
+        if self.clear_pages_data:
+            # Start a new crawl with an empty page results file, later calls append to it
+            open(self.PAGES_DATA_FILE, "wb").close()
+            self.clear_pages_data = False
+
+        # Skip duplicate URLs and pages already scraped by this instance
+        urls = [url for url in dict.fromkeys(urls) if url not in self.processed_urls]
+
+        # Start one warm driver per worker before scraping begins
+        self.start_driver_pool()
+
         # Use ThreadPoolExecutor to execute scraping tasks concurrently
-        with ThreadPoolExecutor(max_workers=1) as executor:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor, open(self.PAGES_DATA_FILE, "ab") as pages_file:
             # Map each URL to the scrape_page function and execute asynchronously
-            results = list(executor.map(self.scrape_page, urls))
-            
-            # Iterate over the results of scraping each URL
-            for result in results:
-                # Extract the date and events from the result
-                for date, events in result.items():
-                    # Extend the events list if the date already exists in the dictionary,
-                    # otherwise, add a new entry for the date
-                    if date in all_events_obj:
-                        all_events_obj[date].extend(events)
-                    else:
-                        all_events_obj[date] = events
-                        
-        # Sort the events by date and save them to a JSON file
-        self.sort_and_save_data_to_file(all_events_obj, "events_data.json")
+            results = executor.map(self.scrape_page, urls)
+
+            # Write each page result as soon as it is ready instead of keeping all of them in memory
+            for url, result in zip(urls, results):
+                # Failed pages are not written so they are scraped again on the next call
+                if url in self.processed_urls:
+                    pages_file.write(orjson.dumps({"url": url, "events": result}) + b"\n")
+                    pages_file.flush()
+
+        # Merge all page results, sort the events by date and save them to a JSON file
+        all_events_obj = self.load_pages_data(self.PAGES_DATA_FILE)
+        self.sort_and_save_data_to_file(all_events_obj, self.EVENTS_DATA_FILE)
+
+        # Keep browser state for the next run, only after the events are saved as it is optional
+        if self.drivers:
+            self.save_cookies(self.drivers[0])
+
+
+    def load_pages_data(self, filename):
+        """
+        Merges page results stored one JSON object per line into a single events object.
+        :param filename: The name of the JSONL file with page results.
+        :return: A dictionary of events keyed by date.
+        """
+        all_events_obj = {}
+        # (date, link) pairs already added, the same event can be listed by several pages
+        seen_events = set()
+
+        for page in self.read_pages_data(filename):
+            # Extract the date and events from the page result
+            for date, events in page["events"].items():
+                date_events = all_events_obj.setdefault(date, [])
+                for event in events:
+                    event_id = (date, event["event_link"])
+                    if event_id not in seen_events:
+                        seen_events.add(event_id)
+                        date_events.append(event)
+
+        return all_events_obj
+
+
+    def read_pages_data(self, filename):
+        """
+        Reads page results stored one JSON object per line.
+        A missing file yields nothing and a line cut off by an interrupted run is skipped.
+        :param filename: The name of the JSONL file with page results.
+        :return: Generator of {"url": ..., "events": ...} page results.
+        """
+        try:
+            with open(filename, "rb") as pages_file:
+                for line in pages_file:
+                    try:
+                        yield orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        self.logger.warning("Skipping incomplete line in %s", filename)
+        except FileNotFoundError:
+            return
 
 
     def create_soup(self, page_source):
         """
-        Parses the page source with BeautifulSoup to extract relevant event information.
+        Parses the page source with selectolax (Lexbor) to extract relevant event information.
         :param page_source: The HTML content of the page.
         :return: A dictionary of events categorized by date.
         """
         try:
-            soup = BeautifulSoup(page_source, "html.parser")
-            contents = soup.find_all("div", class_=self.CLASS_TO_SCRAPE_BS4)
-            # create extracted object with event details
-            extracted_events = {}
+            tree = LexborHTMLParser(page_source)
+            contents = tree.css(self.CLASS_TO_SCRAPE_SELENIUM)
+            # raw event details of every event card
+            event_records = []
 
             # loop through events
             for content in contents:
+                # query each element once and reuse the matched node
+                event_link_element = content.css_first(self.EVENT_LINK_SELECTOR)
+                event_title_element = event_link_element.css_first(self.EVENT_TITLE_SELECTOR) if event_link_element else None
+                # Skip cards without a link or title instead of failing the whole page
+                if event_title_element is None:
+                    self.logger.info("Skipping event card without a link or title")
+                    continue
+                event_link = event_link_element.attributes.get("href") or ""
+                event_title = event_title_element.text()
                 # defines particular event elements
-                event_date_element = content.find("span", class_ = self.EVENT_DATE_ELEMENT_CSS_CLASS)
-                event_date = event_date_element.find("span", class_ = self.EVENT_DATE_CSS_CLASS).text if event_date_element else "No Date Available"
-                converted_event_date = self.convert_dates(event_date)
-                event_link = content.find("a", class_ = self.EVENT_LINK)["href"]
-                event_title = content.find("a", class_=self.EVENT_LINK).find("span", class_="").text
-                event_place_parent = content.find('div', class_ = self.EVENT_PLACE_PARENT)
+                event_date_element = content.css_first(self.EVENT_DATE_ELEMENT_SELECTOR)
+                event_date_node = event_date_element.css_first(self.EVENT_DATE_SELECTOR) if event_date_element else None
+                event_date = event_date_node.text() if event_date_node else "No Date Available"
+                event_place_parent = content.css_first(self.EVENT_PLACE_PARENT_SELECTOR)
                 # calculate event place based on conditions
                 event_place = ""
-                event_by_place_css_class = self.EVENT_BY_PLACE
-                if event_place_parent.find('a', class_ = event_by_place_css_class):
-                    event_place = event_place_parent.find('a', class_ = event_by_place_css_class).text
-                else:
-                    event_place = content.find('div', class_='x1gslohp').find('div').get_text(strip=True)
-
-                # local event
-                local_event_object = {
-                    "event_title": event_title,
-                    "event_link": self.remove_query_string(event_link),
-                    "event_place": event_place
-                }
-
-                # Check if date exists in main events object
-                if converted_event_date not in extracted_events:
-                    extracted_events[converted_event_date] = []
-
-                # Check if the event link already exists for this date
-                existing_links = {event['event_link'] for event in extracted_events[converted_event_date]}
-                if local_event_object['event_link'] not in existing_links:
-                    extracted_events[converted_event_date].append(local_event_object)
-
+                if event_place_parent:
+                    event_by_place_element = event_place_parent.css_first(self.EVENT_BY_PLACE_SELECTOR)
+                    event_place_div = event_place_parent.css_first('div')
+                    if event_by_place_element:
+                        event_place = event_by_place_element.text()
+                    elif event_place_div:
+                        # Text nodes joined by a space with whitespace collapsed, same as joinedText in EXTRACT_EVENTS_SCRIPT
+                        event_place = " ".join(event_place_div.text(separator=" ").split())
+
+                event_records.append({
+                    "date": event_date,
+                    "link": event_link,
+                    "title": event_title,
+                    "place": event_place
+                })
+
+            extracted_events = self.group_events(event_records)
         except Exception as e:
-            self.logger.error(f"Error creating soup: {e}")
-            traceback.print_exc()
+            self.logger.error("Error creating soup: %s", e, exc_info=True)
             return {}
 
         return extracted_events
 
 
+    def extract_events_in_browser(self, driver):
+        """
+        Extracts event details inside the browser with a single script call,
+        so only a small list of records is transferred instead of the whole page source.
+        :param driver: The Selenium WebDriver instance with the loaded page.
+        :return: A dictionary of events categorized by date.
+        """
+        event_records = driver.execute_script(EXTRACT_EVENTS_SCRIPT, self.EVENT_SELECTORS)
+        return self.group_events(event_records)
+
+
+    def group_events(self, event_records):
+        """
+        Converts raw event records into event objects grouped by date.
+        :param event_records: List of dicts with 'date', 'link', 'title' and 'place' of each event card.
+        :return: A dictionary of events categorized by date.
+        """
+        # create extracted object with event details
+        extracted_events = {}
+        # (date, link) pairs already added, kept up to date instead of rebuilt for every event
+        seen_events = set()
+
+        for event_record in event_records:
+            converted_event_date = self.convert_dates(event_record["date"])
+            event_link = self.remove_query_string(event_record["link"])
+
+            # Skip the event if its link already exists for this date
+            event_id = (converted_event_date, event_link)
+            if event_id in seen_events:
+                continue
+            seen_events.add(event_id)
+
+            # local event
+            local_event_object = {
+                "event_title": event_record["title"],
+                "event_link": event_link,
+                "event_place": event_record["place"]
+            }
+            extracted_events.setdefault(converted_event_date, []).append(local_event_object)
+
+        return extracted_events
+
+
     def convert_to_date(self, date_str):
         """
         Converts a date string to a datetime object.
         :param date_str: The date string to convert.
         :return: The datetime object representing the date.
         """
-        try:
-            return datetime.strptime(date_str, '%d/%m/%y')
-        except ValueError:
-            return None
+        return parse_event_date(date_str)
 
 
     def sort_and_save_data_to_file(self, all_events_obj, filename):
@@ -323,17 +652,15 @@ class EventScraper:
             filename (str): The name of the JSON file to save the object to.
         """
         try:
-            # Sort the dictionary by date
+            # Sort the dictionary by date, keys stay as 'DD/MM/YY' strings.
+            # sorted() computes each key once up front, ranges and 'Brak daty' go last
             sorted_events_obj = dict(sorted(all_events_obj.items(), key=lambda item: self.convert_to_date(item[0]) or datetime.max))
 
-            # Convert keys back to strings
-            sorted_events_obj_str = {key.strftime('%d/%m/%y') if isinstance(key, datetime) else key: value for key, value in sorted_events_obj.items()}
-
-            # Save the sorted events object to a JSON file
-            with open(filename, "w", encoding="utf-8") as output:
-                json.dump(sorted_events_obj, output, ensure_ascii=False, indent=4)
+            # Save the sorted events object to a JSON file, orjson encodes straight to UTF-8 bytes
+            with open(filename, "wb") as output:
+                output.write(orjson.dumps(sorted_events_obj, option=orjson.OPT_INDENT_2))
         except Exception as e:
-            self.logger.error(f"Error saving data to file: {e}")
+            self.logger.error("Error saving data to file: %s", e)
 
 
     def set_chrome_options(self):
@@ -342,6 +669,12 @@ class EventScraper:
         :return: Configured ChromeOptions object.
         """
         options = webdriver.ChromeOptions()
+        # Return from driver.get() on DOMContentLoaded, readiness is checked with explicit waits
+        options.page_load_strategy = "eager"
+        if self.debugger_address:
+            # Attach to the running Chrome, launch arguments do not apply to it
+            options.debugger_address = self.debugger_address
+            return options
         options.add_argument("--headless")
         options.add_argument("--disable-gpu")
         options.add_argument("--disable-notifications")
@@ -354,27 +687,202 @@ class EventScraper:
         options.add_argument("--enable-features=NetworkService,NetworkServiceInProcess")
         options.add_argument("--profile-directory=Default")
         options.add_experimental_option("excludeSwitches", ["enable-logging"])
+        # Skip image decoding and notification prompts at the profile level as well
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2
+        })
         return options
 
 
     def start_driver(self):
         """
         Initializes and starts the Chrome WebDriver with configured options.
+        :return: The started WebDriver instance.
         """
         # Set Chrome options
         options = self.set_chrome_options()
         # Initialize Chrome WebDriver
-        self.driver = webdriver.Chrome(options=options)
+        driver = webdriver.Chrome(options=options)
+        try:
+            if self.debugger_address:
+                # Every driver works in its own tab of the shared browser
+                driver.switch_to.new_window("tab")
+            # Scrolling runs as one async script, allow it to take longer than the default 30 seconds
+            driver.set_script_timeout(60)
+            # Block unneeded resources inside the browser using Chrome DevTools Protocol
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.BLOCKED_URL_PATTERNS})
+            # Dismiss popups from inside every loaded page
+            self.dismiss_popups(driver)
+        except Exception:
+            # Do not leave a half configured browser running, it is not tracked in self.drivers yet.
+            # An attached browser is the user's own, only its chromedriver is stopped
+            if self.debugger_address:
+                driver.service.stop()
+            else:
+                driver.quit()
+            raise
+        # Restore cookies saved by the previous run
+        self.load_cookies(driver)
+        # Keep track of every started driver so all of them can be stopped
+        with self.drivers_lock:
+            self.drivers.append(driver)
+        return driver
+
+
+    def load_cookies(self, driver):
+        """
+        Loads Facebook cookies saved by a previous run into the browser.
+        :param driver: The Selenium WebDriver instance.
+        """
+        if self.debugger_address:
+            # An attached browser keeps its own cookies
+            return
+        try:
+            with open(self.COOKIES_FILE, "rb") as cookies_file:
+                cookies = [cookie for cookie in orjson.loads(cookies_file.read()) if is_facebook_cookie(cookie)]
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+        except FileNotFoundError:
+            return
+        except (orjson.JSONDecodeError, TypeError, AttributeError, OSError, WebDriverException) as e:
+            # Saved cookies are optional, a corrupt file must not stop the driver from starting
+            self.logger.warning("Could not load cookies from %s: %s", self.COOKIES_FILE, e)
+
+
+    def save_cookies(self, driver):
+        """
+        Saves the Facebook cookies, e.g. accepted cookie consent, for the next run.
+        Cookies of other sites are never written to the file.
+        :param driver: The Selenium WebDriver instance.
+        """
+        if self.debugger_address:
+            # An attached browser is the user's own, its cookies stay in its profile
+            return
+        cookie_fields = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite")
+        cookies = []
+        try:
+            for cookie in driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]:
+                if not is_facebook_cookie(cookie):
+                    continue
+                cookie_params = {field: cookie[field] for field in cookie_fields if field in cookie}
+                # Session cookies have no expiry date
+                if not cookie.get("session"):
+                    cookie_params["expires"] = cookie["expires"]
+                cookies.append(cookie_params)
+            with open(self.COOKIES_FILE, "wb") as cookies_file:
+                cookies_file.write(orjson.dumps(cookies))
+        except (WebDriverException, OSError) as e:
+            # Saved cookies are optional, a closed or crashed browser only costs the next run a cookie prompt
+            self.logger.warning("Could not save cookies to %s: %s", self.COOKIES_FILE, e)
+
+
+    def start_driver_pool(self):
+        """
+        Starts drivers until the pool holds one warm driver per worker.
+        """
+        while len(self.drivers) < self.max_workers:
+            self.driver_pool.put(self.start_driver())
+
+
+    def release_driver(self, driver):
+        """
+        Resets the driver to a blank page and puts it back into the pool for the next URL.
+        :param driver: The Selenium WebDriver instance taken from the pool.
+        """
+        self.driver_uses[driver.session_id] = self.driver_uses.get(driver.session_id, 0) + 1
+        if self.driver_uses[driver.session_id] >= self.MAX_DRIVER_USES and self.recycle_driver(driver):
+            # Long used driver was replaced, Chrome memory keeps growing over many page loads
+            return
+
+        try:
+            # Unload the previous page so it does not keep running scripts and holding memory
+            driver.get("about:blank")
+        except WebDriverException:
+            # The browser most likely crashed, replace it so later URLs do not fail on it
+            self.logger.warning("Could not reset driver to a blank page, replacing it")
+            if self.recycle_driver(driver):
+                return
+        self.driver_pool.put(driver)
+
+
+    def recycle_driver(self, driver):
+        """
+        Quits the driver and puts a freshly started one into the pool in its place.
+        :param driver: The Selenium WebDriver instance to replace.
+        :return: True if the driver was replaced, False if it has to be kept because no new driver could be started.
+        """
+        try:
+            new_driver = self.start_driver()
+        except (WebDriverException, OSError) as e:
+            # Keep the old driver to preserve the pool size, replacing it is retried on a later release
+            self.logger.warning("Could not start replacement driver, keeping the old one: %s", e)
+            self.driver_uses[driver.session_id] = 0
+            return False
+
+        with self.drivers_lock:
+            self.drivers.remove(driver)
+        self.driver_uses.pop(driver.session_id, None)
+        try:
+            self.quit_driver(driver)
+        except Exception as e:
+            # A crashed browser can fail to quit in many ways, the new driver is already in place
+            self.logger.warning("Could not quit recycled driver: %s", e)
+        self.driver_pool.put(new_driver)
+        return True
+
+
+    def quit_driver(self, driver):
+        """
+        Quits a single driver. When attached to a shared browser only its tab is closed.
+        :param driver: The Selenium WebDriver instance to quit.
+        """
+        if self.debugger_address:
+            # Close only our tab and the chromedriver process, the shared browser keeps running
+            try:
+                driver.close()
+            finally:
+                # Stop chromedriver also when the tab is already gone
+                driver.service.stop()
+        else:
+            driver.quit()
 
 
     def stop_driver(self):
         """
-        Stops the Chrome WebDriver if it is running.
+        Stops all running Chrome WebDrivers.
         """
-        # Check if the driver attribute exists and is not None
-        if hasattr(self, 'driver') and self.driver:
-            # Quit the WebDriver
-            self.driver.quit()
+        with self.drivers_lock:
+            drivers, self.drivers = self.drivers, []
+        for driver in drivers:
+            # Quit the WebDriver, a crashed browser must not keep the others running
+            try:
+                self.quit_driver(driver)
+            except Exception as e:
+                self.logger.warning("Could not quit driver: %s", e)
+        self.driver_uses = {}
+        self.driver_pool = queue.Queue()
+
+
+    def __enter__(self):
+        """
+        Starts the driver pool so the scraper can be used as a context manager.
+        :return: The scraper instance.
+        """
+        try:
+            self.start_driver_pool()
+        except BaseException:
+            # __exit__ does not run when __enter__ fails, stop the drivers started so far
+            self.stop_driver()
+            raise
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """
+        Stops all drivers when leaving the context, also when scraping raised an exception.
+        """
+        self.stop_driver()
 
 
     def start_timer(self):
@@ -394,22 +902,25 @@ class EventScraper:
 
 
 if __name__ == "__main__":
-    scraper = EventScraper("my_liked_pages.csv")
+    # Setup logging to file for error tracking and debugging, configured once per process
+    # Log level can be raised for debugging with FB_SCRAPER_LOG, e.g. FB_SCRAPER_LOG=DEBUG
+    logging.basicConfig(filename="scraping.log", level=os.getenv("FB_SCRAPER_LOG", "WARNING").upper())
+
+    # Set FB_CHROME_DEBUGGER_ADDRESS (e.g. 127.0.0.1:9222) to reuse a Chrome started with --remote-debugging-port
+    # Set FB_RESUME=1 to continue an interrupted crawl without scraping saved pages again
+    scraper = EventScraper(
+        "my_liked_pages.csv",
+        debugger_address=os.getenv("FB_CHROME_DEBUGGER_ADDRESS"),
+        resume=os.getenv("FB_RESUME") == "1"
+    )
     # start timer
     scraper.start_timer()
 
-    urls = []
-
-    with open(scraper.CSV_FILE, "r") as csvfile:
-        reader = csv.reader(csvfile)
-        next(reader)  # Skip the header row
-        for row in reader:
-            urls.extend(row)
+    urls = scraper.read_urls()
 
-    try:
+    # Drivers are stopped on exit, also when scraping fails
+    with scraper:
         scraper.scrape_subpages(urls)
-    finally:
-        scraper.stop_driver()
 
     elapsed_time = scraper.stop_timer()
     print(f"Elapsed time: {elapsed_time} seconds")
\ No newline at end of file
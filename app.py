@@ -1,13 +1,18 @@
-import json
+import orjson
+import os
 from datetime import datetime, timedelta
+from functools import lru_cache
 from flask import Flask, render_template
 
 app = Flask(__name__)
 app.config["DEBUG"] = True
 
 EVENTS_DATA_FILE = "events_data.json"
+# Parsed events data and the file modification time it was read at
+events_data_cache = {"mtime": None, "data": {}}
 
 @app.template_filter('str_to_datetime')
+@lru_cache(maxsize=1024)
 def str_to_datetime(date_str, date_format='%d/%m/%y'):
     """
     Custom filter for display datetime
@@ -42,12 +47,15 @@ def display_data_in_web_app():
 
 def load_events_data():
     """
-    Load events data from JSON file
+    Load events data from JSON file, the file is parsed again only after the scraper rewrites it
     """
     try:
-        with open(EVENTS_DATA_FILE) as json_file:
-            events = json.load(json_file)
-        return events
+        mtime = os.path.getmtime(EVENTS_DATA_FILE)
+        if mtime != events_data_cache["mtime"]:
+            with open(EVENTS_DATA_FILE, "rb") as json_file:
+                events_data_cache["data"] = orjson.loads(json_file.read())
+            events_data_cache["mtime"] = mtime
+        return events_data_cache["data"]
     except FileNotFoundError:
         # Return empty dictionary if file does not exist yet
         return {}